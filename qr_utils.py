@@ -4,16 +4,80 @@ QR Code Utilities Module
 Provides functions for reading QR codes from images and screenshots
 """
 
+import functools
+import hashlib
+import shutil
 import subprocess
 import os
 import sys
 import time
 from pathlib import Path
-from typing import Optional, Union
+from typing import Dict, Optional, Union
+
+# Optional heavy imports (Pillow and pyobjc each cost ~100-300ms) are probed
+# lazily on first use so importing qr_utils doesn't slow wizard startup.
+# Each cache is None (not probed yet), () (unavailable), or the module tuple.
+_pyzbar_modules = None
+_appkit_modules = None
+
+
+def _qr_decoder():
+    """
+    Probe the optional in-process decoder on first use. pyzbar wraps the same
+    libzbar that the brew `zbar` package provides, but skips the zbarimg fork
+    per decode. Returns (decode, Image, ImageOps) or () when unavailable.
+    """
+    global _pyzbar_modules
+    if _pyzbar_modules is None:
+        try:
+            from pyzbar.pyzbar import decode
+            from PIL import Image, ImageOps
+            _pyzbar_modules = (decode, Image, ImageOps)
+        except ImportError:
+            _pyzbar_modules = ()
+    return _pyzbar_modules
+
+
+def _appkit_pasteboard():
+    """
+    Probe the optional pyobjc clipboard on first use (avoids a pbcopy fork per
+    copy). Returns (NSPasteboard, NSPasteboardTypeString) or () when missing.
+    """
+    global _appkit_modules
+    if _appkit_modules is None:
+        try:
+            from AppKit import NSPasteboard, NSPasteboardTypeString
+            _appkit_modules = (NSPasteboard, NSPasteboardTypeString)
+        except ImportError:
+            _appkit_modules = ()
+    return _appkit_modules
+
+
+def prewarm() -> None:
+    """Pay the optional-import and PATH-probe costs ahead of the first capture.
+
+    Runs on background threads, so it must stay silent: it warms the cached
+    probes only and leaves reporting to the synchronous preflight.
+    """
+    if is_macos():
+        _missing_commands()
+    _qr_decoder()
+    _appkit_pasteboard()
 
 
 def copy_to_clipboard(text: str) -> bool:
-    """Copy text to macOS clipboard using pbcopy"""
+    """Copy text to macOS clipboard (NSPasteboard in-process, pbcopy fallback)"""
+    appkit = _appkit_pasteboard()
+    if appkit:
+        NSPasteboard, NSPasteboardTypeString = appkit
+        try:
+            pasteboard = NSPasteboard.generalPasteboard()
+            pasteboard.clearContents()
+            if pasteboard.setString_forType_(text, NSPasteboardTypeString):
+                return True
+        except Exception:
+            pass  # Fall back to the pbcopy subprocess below
+
     try:
         process = subprocess.run(['pbcopy'], input=text.encode('utf-8'), check=True)
         return True
@@ -25,6 +89,24 @@ def copy_to_clipboard(text: str) -> bool:
         return False
 
 
+def read_clipboard() -> str:
+    """Read text from the macOS clipboard (NSPasteboard in-process, pbpaste fallback)"""
+    appkit = _appkit_pasteboard()
+    if appkit:
+        NSPasteboard, NSPasteboardTypeString = appkit
+        try:
+            pasteboard = NSPasteboard.generalPasteboard()
+            return pasteboard.stringForType_(NSPasteboardTypeString) or ""
+        except Exception:
+            pass  # Fall back to the pbpaste subprocess below
+
+    try:
+        result = subprocess.run(['pbpaste'], capture_output=True, text=True, check=True)
+        return result.stdout
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return ""
+
+
 def show_alert(title: str, message: str) -> bool:
     """Show a macOS alert dialog"""
     try:
@@ -59,39 +141,73 @@ def focus_signal_app() -> bool:
         return False
 
 
+# Captures smaller than this are blank or truncated (e.g. screen recording
+# permission denied) and never contain a readable QR code.
+_MIN_SCREENSHOT_BYTES = 10000
+
+
+def _show_alert_and_focus_signal(title: str, message: str) -> None:
+    """
+    Pre-screenshot alert + Signal focus in a single osascript invocation
+    (each osascript fork costs tens of ms; no need to pay it twice).
+    """
+    script = (
+        f'display dialog "{message}" with title "{title}" '
+        'buttons {"OK"} default button "OK"\n'
+        'try\n'
+        'tell application "Signal" to activate\n'
+        'end try'
+    )
+    try:
+        subprocess.run(['osascript', '-e', script], check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        # If the dialog fails, fall back to console output and keep going
+        print(f"{title}: {message}")
+
+
 def take_interactive_screenshot(debug: bool = False, attempt: int = 1) -> Optional[str]:
     """Take an interactive screenshot using macOS screencapture"""
     timestamp = int(time.time())
-    screenshot_file = f"qr_screenshot_{timestamp}.png"
+    # TIFF skips the PNG deflate pass, so screencapture returns noticeably
+    # faster on large selections; zbarimg and pyzbar both read TIFF fine.
+    screenshot_file = f"qr_screenshot_{timestamp}.tiff"
     
     try:
         # Show alert before screenshot selector
         alert_message = "After you press 'OK' you will get a selector that you should draw a square on top of the QR code in Signal Desktop"
         if attempt > 1:
             alert_message += f"\\n\\nAttempt #{attempt} of 3"
-        show_alert("QR Code Screenshot", alert_message)
-        
+        # Alert + focus Signal in one osascript call
+        _show_alert_and_focus_signal("QR Code Screenshot", alert_message)
+
         print("📸 Taking screenshot... Select the QR code area")
-        
-        # Focus Signal app
-        focus_signal_app()
-        
+
         # Try screencapture first
-        result = subprocess.run(['screencapture', '-i', screenshot_file], check=True)
+        result = subprocess.run(['screencapture', '-i', '-t', 'tiff', screenshot_file], check=True)
         
-        # Check if file was actually created (user might have cancelled)
-        if os.path.exists(screenshot_file) and os.path.getsize(screenshot_file) > 0:
+        # Check if file was actually created (user might have cancelled).
+        # One stat covers existence, emptiness, and the debug size report.
+        try:
+            file_size = os.stat(screenshot_file).st_size
+        except FileNotFoundError:
+            file_size = 0
+
+        if file_size >= _MIN_SCREENSHOT_BYTES:
             if debug:
-                file_size = os.path.getsize(screenshot_file)
                 print(f"📸 Screenshot saved to: {screenshot_file}")
                 print(f"📊 File size: {file_size} bytes")
-                
-                # Check if the screenshot might be just desktop background
-                if file_size < 10000:  # Very small file might indicate failure
-                    print("⚠️  Warning: Screenshot file is very small, may not have captured properly")
-                    print("   Try granting Screen Recording permission to Terminal/Python")
-            
+
             return screenshot_file
+        elif file_size > 0:
+            # A capture this small is a blank/failed grab (often a missing
+            # Screen Recording permission) — don't waste a decode attempt on it.
+            print("⚠️  Screenshot file is very small, may not have captured properly")
+            print("   Try granting Screen Recording permission to Terminal/Python")
+            try:
+                os.remove(screenshot_file)
+            except OSError:
+                pass
+            return None
         else:
             print("Screenshot cancelled by user or failed")
             return None
@@ -105,8 +221,92 @@ def take_interactive_screenshot(debug: bool = False, attempt: int = 1) -> Option
 
 
 
+# Decode results keyed by screenshot bytes, so identical retakes in the retry
+# loop don't re-run the decoder. Session-scoped and bounded.
+_decode_cache: Dict[bytes, Optional[str]] = {}
+_DECODE_CACHE_MAX = 32
+
+
 def read_qr_code_from_image(image_path: Union[str, Path]) -> Optional[str]:
     """Read QR code from image using zbar (local tool)"""
+    try:
+        # Hash in chunks — uncompressed TIFF captures can be tens of MB and
+        # never need to sit in memory whole.
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                hasher.update(chunk)
+        digest = hasher.digest()
+    except OSError:
+        digest = None
+
+    if digest is not None and digest in _decode_cache:
+        return _decode_cache[digest]
+
+    result = _decode_qr_image(image_path)
+    if result is None and _qr_decoder():
+        result = _decode_with_preprocessing(image_path)
+
+    if digest is not None:
+        if len(_decode_cache) >= _DECODE_CACHE_MAX:
+            _decode_cache.clear()
+        _decode_cache[digest] = result
+    return result
+
+
+def _decode_with_preprocessing(image_path: Union[str, Path]) -> Optional[str]:
+    """
+    Rescue pass for marginal captures: decode autocontrast / 2x upscale /
+    thresholded variants concurrently, first hit wins. pyzbar releases the
+    GIL inside libzbar, so the decodes genuinely overlap.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    decode, Image, ImageOps = _qr_decoder()
+    try:
+        img = Image.open(image_path)
+        if max(img.size) > 1024:
+            img.thumbnail((1024, 1024))
+        gray = img.convert('L')
+        variants = [
+            ImageOps.autocontrast(gray),
+            img.resize((img.width * 2, img.height * 2)),
+            gray.point(lambda p: 255 if p > 128 else 0),
+        ]
+    except Exception:
+        return None
+
+    with ThreadPoolExecutor(max_workers=len(variants)) as pool:
+        futures = [pool.submit(decode, v) for v in variants]
+        for future in as_completed(futures):
+            try:
+                symbols = future.result()
+            except Exception:
+                continue
+            if symbols:
+                return symbols[0].data.decode('utf-8')
+    return None
+
+
+def _decode_qr_image(image_path: Union[str, Path]) -> Optional[str]:
+    """Run the actual decoders (pyzbar fast path, zbarimg fallback)."""
+    decoder = _qr_decoder()
+    if decoder:
+        decode, Image, _ImageOps = decoder
+        try:
+            img = Image.open(image_path)
+            # Retina captures can be several megapixels; QR decoding only needs
+            # a few pixels per module, so cap the long edge before scanning.
+            if max(img.size) > 1024:
+                img.thumbnail((1024, 1024))
+            symbols = decode(img)
+            if symbols:
+                return symbols[0].data.decode('utf-8')
+            # No symbols found in-process; fall through to zbarimg, which
+            # handles a few image formats Pillow doesn't.
+        except Exception:
+            pass  # Fall back to the zbarimg subprocess below
+
     try:
         # Use zbarimg to decode QR code from image
         result = subprocess.run(
@@ -191,6 +391,18 @@ def show_terminal_permission_error():
     sys.exit(1)
 
 
+# Fully static AppleScript for the "did you grant permissions?" retry dialog;
+# built once so the retry loop doesn't re-assemble a ~400-byte literal.
+_RETRY_DIALOG_OSA = (
+    'display dialog "🚨 QR code reading failed!\n\n'
+    'Have you given your terminal screen recording permissions in '
+    'System Preferences > Security & Privacy > Privacy > Screen Recording?\n\n'
+    'Click Yes if you have, No if you need instructions." '
+    'buttons {"I need instructions", "Yes, I gave permissions"} '
+    'default button "I need instructions"'
+)
+
+
 def copy_qr_code_from_screenshot(debug: bool = False) -> Optional[str]:
     """
     Take a screenshot, read QR code, and return the data.
@@ -239,8 +451,7 @@ def copy_qr_code_from_screenshot(debug: bool = False) -> Optional[str]:
                     # Show dialog asking if they've given permissions
                     try:
                         result = subprocess.run([
-                            'osascript', '-e', 
-                            'display dialog "🚨 QR code reading failed!\n\nHave you given your terminal screen recording permissions in System Preferences > Security & Privacy > Privacy > Screen Recording?\n\nClick Yes if you have, No if you need instructions." buttons {"I need instructions", "Yes, I gave permissions"} default button "I need instructions"'
+                            'osascript', '-e', _RETRY_DIALOG_OSA
                         ], capture_output=True, text=True, check=True)
                         
                         if "Yes" in result.stdout:
@@ -274,10 +485,7 @@ def copy_qr_code_from_screenshot(debug: bool = False) -> Optional[str]:
                 print("   You can manually delete it when done, or it will be overwritten on next run")
             else:
                 # Clean up screenshot file in normal mode
-                try:
-                    os.remove(screenshot_path)
-                except:
-                    pass  # Ignore cleanup errors
+                Path(screenshot_path).unlink(missing_ok=True)
     
     # This should never be reached
     return None
@@ -299,19 +507,21 @@ def is_macos() -> bool:
     return sys.platform == "darwin"
 
 
+@functools.lru_cache(maxsize=None)
+def _missing_commands() -> tuple:
+    """Required commands absent from PATH (cached per process, prints nothing)"""
+    required_commands = ['screencapture', 'pbcopy', 'zbarimg']
+    return tuple(cmd for cmd in required_commands if shutil.which(cmd) is None)
+
+
 def check_dependencies() -> bool:
     """Check if required system commands are available"""
     if not is_macos():
         print("This module is designed for macOS only")
         return False
-    
-    required_commands = ['screencapture', 'pbcopy', 'zbarimg']
-    missing_commands = []
-    
-    for cmd in required_commands:
-        if subprocess.run(['which', cmd], capture_output=True).returncode != 0:
-            missing_commands.append(cmd)
-    
+
+    missing_commands = _missing_commands()
+
     if missing_commands:
         print(f"Missing required commands: {', '.join(missing_commands)}")
         if 'zbarimg' in missing_commands:
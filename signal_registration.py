@@ -4,14 +4,17 @@ Signal CLI Registration Core Module
 Provides core functionality for Signal CLI registration and device linking
 """
 
+import atexit
+import functools
 import json
 import re
 import shutil
+import signal
 import subprocess
+import sys
+import threading
 import time
 import os
-import urllib.error
-import urllib.request
 from pathlib import Path
 from typing import Optional, Tuple
 from dataclasses import dataclass
@@ -27,6 +30,13 @@ _GITHUB_SIGNAL_CLI_LATEST = (
 )
 _GITHUB_API_TIMEOUT_SEC = 10
 
+# URI scheme the captcha page hands back; shared by token extraction here and
+# the wizard's clipboard parsing.
+CAPTCHA_URI_PREFIX = "signalcaptcha://"
+
+# Scheme prefix of Signal Desktop's device-linking QR payload.
+LINK_URI_PREFIX = "sgnl://linkdevice?"
+
 # Import optional dependencies
 try:
     import qr_utils
@@ -58,6 +68,19 @@ class AppConfig:
     launcher_icon_id: Optional[str] = None
 
 
+# E.164: '+' then 7–15 digits, no leading zero. Compiled once at import so
+# both the wizard prompt and flag mode validate through the same pattern.
+_E164_RE = re.compile(r"^\+[1-9]\d{6,14}$")
+
+
+def is_valid_phone_number(phone_number: str) -> bool:
+    """
+    Cheap E.164 sanity check. Catches typos locally instead of paying a
+    signal-cli JVM start for the server-side rejection.
+    """
+    return bool(_E164_RE.match(phone_number))
+
+
 def copy_signal_app_bundle_to_user_applications(
     source_app_path: Optional[str],
     app_bundle_name: str,
@@ -69,8 +92,6 @@ def copy_signal_app_bundle_to_user_applications(
     if not source_app_path:
         return False, "No source path — build the launcher first."
     src = Path(source_app_path)
-    if not src.is_dir():
-        return False, f"Source app not found: {src}"
 
     dest_root = Path.home() / "Applications"
     try:
@@ -82,7 +103,20 @@ def copy_signal_app_bundle_to_user_applications(
     try:
         if dest.exists():
             shutil.rmtree(dest)
-        shutil.copytree(src, dest)
+        # On APFS, cp -c clones the bundle copy-on-write — a metadata-only
+        # operation instead of a per-file byte copy.
+        cloned = subprocess.run(
+            ["cp", "-c", "-R", str(src), str(dest)],
+            capture_output=True,
+        )
+        if cloned.returncode != 0:
+            # Not on APFS (or cp balked) — clear any partial clone and byte-copy.
+            # copytree also raises if src is missing, so no pre-check stat needed.
+            if dest.exists():
+                shutil.rmtree(dest)
+            shutil.copytree(src, dest)
+    except FileNotFoundError:
+        return False, f"Source app not found: {src}"
     except OSError as e:
         return False, str(e)
 
@@ -122,6 +156,16 @@ def _parse_signal_cli_version(text: str) -> Optional[Tuple[int, int, int]]:
     return (int(m.group(1)), int(m.group(2)), int(m.group(3)))
 
 
+# check_signal_cli() runs more than once per session (upfront dependency check,
+# then again at the start of each flow); one GitHub round-trip per process is
+# enough. Caches failures too, so an offline run doesn't hang on every probe.
+_latest_release_cache: Optional[Tuple[int, int, int]] = None
+_latest_release_fetched = False
+
+# One successful signal-cli --version probe is enough per process.
+_cli_version_checked = False
+
+
 def fetch_latest_signal_cli_version_from_github() -> Optional[Tuple[int, int, int]]:
     """
     Latest upstream signal-cli from GitHub Releases (not a Signal API).
@@ -129,7 +173,20 @@ def fetch_latest_signal_cli_version_from_github() -> Optional[Tuple[int, int, in
     Signal's servers do not document a public endpoint to ask “will this client
     version be rejected”; they return HTTP 499 on real requests. Comparing to the
     current signal-cli release is the usual way to stay ahead of DeprecatedVersion.
+
+    The result (including a failed lookup) is cached for the process lifetime.
     """
+    global _latest_release_cache, _latest_release_fetched
+    if _latest_release_fetched:
+        return _latest_release_cache
+    _latest_release_fetched = True
+
+    # urllib.request pulls in http.client/email/ssl (~30 ms); this is the
+    # only caller, and it runs at most once per process — import it here so
+    # --help and error exits never pay for it.
+    import urllib.error
+    import urllib.request
+
     req = urllib.request.Request(
         _GITHUB_SIGNAL_CLI_LATEST,
         headers={
@@ -143,7 +200,8 @@ def fetch_latest_signal_cli_version_from_github() -> Optional[Tuple[int, int, in
             raw = resp.read().decode("utf-8", errors="replace")
         data = json.loads(raw)
         tag = data.get("tag_name") or ""
-        return _parse_signal_cli_version(tag)
+        _latest_release_cache = _parse_signal_cli_version(tag)
+        return _latest_release_cache
     except (
         urllib.error.URLError,
         json.JSONDecodeError,
@@ -201,6 +259,16 @@ def _format_signal_cli_failure(
     return msg
 
 
+def _reap_sync_process(proc: "subprocess.Popen[bytes]") -> None:
+    """Give the background receive sync a bounded grace period at exit."""
+    if proc.poll() is not None:
+        return
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
 class SignalCLICore:
     """Core Signal CLI registration functionality without user interactions"""
     
@@ -208,9 +276,27 @@ class SignalCLICore:
         self.config = config
         self.created_app_name = None
         self.created_app_path = None
-    
-    def check_signal_cli(self) -> bool:
+        # Shared argv prefix for every account-scoped signal-cli call
+        self._cli_prefix = ('signal-cli', '-a', config.phone_number)
+        self._account_registered = False
+        # Profile dir is a pure function of the phone number; build it once.
+        # Path.home() is correct on non-default setups (network homes,
+        # FileVault mounts) where a /Users/$USER guess would not be.
+        digits = config.phone_number.replace('+', '')
+        self._user_data_dir = str(
+            Path.home() / "Library/Application Support" / f"Signal-Profile-{digits}"
+        )
+
+    @staticmethod
+    def check_signal_cli() -> bool:
         """Check if signal-cli is installed, usable, and recent enough for Signal servers."""
+        # Each probe is a full JVM start and the answer is account-independent,
+        # so the memo is process-wide, not per-instance. Failures are not
+        # cached (they raise).
+        global _cli_version_checked
+        if _cli_version_checked:
+            return True
+
         try:
             result = subprocess.run(
                 ["signal-cli", "--version"],
@@ -265,8 +351,9 @@ class SignalCLICore:
                     "Or: https://github.com/AsamK/signal-cli/releases/latest"
                 )
 
+        _cli_version_checked = True
         return True
-    
+
     def check_qr_utilities(self) -> bool:
         """Check if QR utilities are available and working"""
         if not QR_UTILS_AVAILABLE:
@@ -280,55 +367,56 @@ class SignalCLICore:
         except Exception:
             return False
     
-    def check_brew_dependencies(self) -> bool:
+    @staticmethod
+    def check_brew_dependencies() -> bool:
         """Check if required brew dependencies are installed"""
         required_packages = {
             'signal-cli': 'signal-cli',
             'zbarimg': 'zbar'
         }
         
-        missing_packages = []
-        
-        for command, package in required_packages.items():
-            try:
-                result = subprocess.run(['which', command], 
-                                      capture_output=True, text=True, check=False)
-                if result.returncode != 0:
-                    missing_packages.append(package)
-            except Exception:
-                missing_packages.append(package)
-        
+        # shutil.which walks PATH in-process — no fork per probe, so the
+        # lookups are effectively free and need no parallelism.
+        missing_packages = [
+            package
+            for command, package in required_packages.items()
+            if shutil.which(command) is None
+        ]
+
         if missing_packages:
-            print("❌ Missing required dependencies:")
-            print()
-            for package in missing_packages:
-                print(f"   • {package}")
-            print()
-            print("💡 Install missing dependencies with:")
-            print(f"   brew install {' '.join(missing_packages)}")
-            print()
+            lines = [
+                "❌ Missing required dependencies:",
+                "",
+                *(f"   • {package}" for package in missing_packages),
+                "",
+                "💡 Install missing dependencies with:",
+                f"   brew install {' '.join(missing_packages)}",
+                "",
+            ]
+            sys.stdout.write("\n".join(lines) + "\n")
             return False
-        
+
         return True
     
-    def check_signal_desktop_running(self) -> bool:
+    @staticmethod
+    def check_signal_desktop_running() -> bool:
         """Check if Signal Desktop is currently running on macOS"""
         try:
-            # Use pgrep to check for Signal processes
-            result = subprocess.run(['pgrep', '-f', 'Signal.app'], 
-                                  capture_output=True, text=True, check=False)
+            # pgrep matches process names kernel-side; -q because only the
+            # exit code matters, so skip the pipe setup entirely
+            result = subprocess.run(
+                ['pgrep', '-q', '-f', 'Signal.app'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                check=False,
+            )
             return result.returncode == 0
         except Exception:
-            # Fallback to ps aux if pgrep fails
-            try:
-                result = subprocess.run(['ps', 'aux'], 
-                                      capture_output=True, text=True, check=False)
-                return 'Signal.app' in result.stdout
-            except Exception:
-                # If both methods fail, assume Signal is not running
-                return False
+            # pgrep ships with every macOS; if it somehow can't run, assume
+            # Signal is not running rather than scraping ps output
+            return False
     
-    def quit_signal_desktop(self) -> bool:
+    @staticmethod
+    def quit_signal_desktop() -> bool:
         """Attempt to quit Signal Desktop gracefully"""
         try:
             # First try using AppleScript to quit gracefully
@@ -340,21 +428,23 @@ class SignalCLICore:
             time.sleep(2)
             
             # Check if it actually quit
-            if not self.check_signal_desktop_running():
+            if not SignalCLICore.check_signal_desktop_running():
                 return True
             
             # If graceful quit didn't work, try force quit
             result = subprocess.run(['pgrep', '-f', 'Signal.app'], 
                                   capture_output=True, text=True, check=False)
             if result.returncode == 0:
-                pids = result.stdout.strip().split('\n')
-                for pid in pids:
-                    if pid.strip():
-                        subprocess.run(['kill', pid.strip()], check=False)
-                
+                # One SIGTERM syscall per pid instead of a kill fork each
+                for pid in result.stdout.split():
+                    try:
+                        os.kill(int(pid), signal.SIGTERM)
+                    except (ValueError, ProcessLookupError):
+                        pass
+
                 # Wait and check again
                 time.sleep(1)
-                return not self.check_signal_desktop_running()
+                return not SignalCLICore.check_signal_desktop_running()
             
             return True
             
@@ -366,25 +456,18 @@ class SignalCLICore:
         """Extract captcha token from various input formats"""
         # Remove quotes if present
         input_text = input_text.strip('"\'')
-        
-        # Look for signalcaptcha:// pattern
-        if 'signalcaptcha://' in input_text:
-            # Extract everything after signalcaptcha://
-            token_start = input_text.find('signalcaptcha://') + len('signalcaptcha://')
-            return input_text[token_start:]
-        
-        # If no signalcaptcha:// prefix, assume it's just the token
-        if input_text and not input_text.startswith('signalcaptcha://'):
-            return input_text
-        
-        return ""
+
+        # Single scan: everything after signalcaptcha:// if present, otherwise
+        # assume the pasted text is already just the token.
+        _prefix, sep, token = input_text.partition(CAPTCHA_URI_PREFIX)
+        return token if sep else input_text
     
     def register_sms(self, captcha_token: str) -> bool:
         """Register with SMS verification. Raises RegistrationFailedError on failure."""
         try:
             subprocess.run([
-                'signal-cli', '-a', self.config.phone_number, 'register',
-                '--captcha', f"signalcaptcha://{captcha_token}"
+                *self._cli_prefix, 'register',
+                '--captcha', CAPTCHA_URI_PREFIX + captcha_token
             ], check=True, capture_output=True, text=True)
             return True
         except subprocess.CalledProcessError as e:
@@ -403,16 +486,14 @@ class SignalCLICore:
     
     def verify_registration(self, verification_code: str, pin_code: Optional[str] = None) -> bool:
         """Verify the registration with code and optional PIN"""
+        cmd = [*self._cli_prefix, 'verify', verification_code]
+        if pin_code:
+            cmd += ['--pin', pin_code]
         try:
-            if pin_code:
-                subprocess.run([
-                    'signal-cli', '-a', self.config.phone_number, 'verify',
-                    verification_code, '--pin', pin_code
-                ], check=True)
-            else:
-                subprocess.run([
-                    'signal-cli', '-a', self.config.phone_number, 'verify', verification_code
-                ], check=True)
+            subprocess.run(cmd, check=True)
+            # A successful verify means the account is registered; seed the
+            # memo so the next verify_account_registered skips its probe.
+            self._account_registered = True
             return True
         except subprocess.CalledProcessError:
             raise VerificationFailedError("Registration verification failed")
@@ -430,13 +511,7 @@ class SignalCLICore:
             )
         try:
             subprocess.run(
-                [
-                    "signal-cli",
-                    "-a",
-                    self.config.phone_number,
-                    "setPin",
-                    pin,
-                ],
+                [*self._cli_prefix, "setPin", pin],
                 check=True,
                 capture_output=True,
                 text=True,
@@ -450,7 +525,7 @@ class SignalCLICore:
         """Test the registration by sending a test message"""
         try:
             subprocess.run([
-                'signal-cli', '-a', self.config.phone_number, 'send',
+                *self._cli_prefix, 'send',
                 '--note-to-self', '-m', 'Test message - Signal CLI registration successful!'
             ], check=True)
             return True
@@ -459,18 +534,27 @@ class SignalCLICore:
     
     def verify_account_registered(self) -> bool:
         """Verify that the account has at least one device registered in signal-cli"""
+        # A registered account stays registered for the life of this run, so a
+        # positive answer is cached (each probe is a JVM start). Negative
+        # answers re-probe — registration may have just completed.
+        if self._account_registered:
+            return True
         try:
-            result = subprocess.run(['signal-cli', '-a', self.config.phone_number, 'listDevices'], 
+            result = subprocess.run([*self._cli_prefix, 'listDevices'],
                                   capture_output=True, text=True, check=True)
-            # Check if we have at least one device (look for "Device" in output)
-            return "Device" in result.stdout
+            # Anchored per-line match instead of a substring scan of the whole
+            # output; any() short-circuits on the first device line.
+            self._account_registered = any(
+                line.lstrip("- ").startswith("Device")
+                for line in result.stdout.splitlines()
+            )
+            return self._account_registered
         except subprocess.CalledProcessError:
             return False
     
     def launch_signal_desktop(self) -> str:
         """Launch Signal Desktop with specific profile and return profile directory"""
-        profile_dir = self.config.phone_number.replace('+', '')
-        user_data_dir = f"/Users/{os.getenv('USER', os.getenv('USERNAME', 'unknown'))}/Library/Application Support/Signal-Profile-{profile_dir}"
+        user_data_dir = self._user_data_dir
         
         try:
             subprocess.Popen([
@@ -479,44 +563,37 @@ class SignalCLICore:
             ], start_new_session=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except Exception as e:
             raise SignalRegistrationError(f"Failed to launch Signal Desktop: {e}")
-        
+
+        # Signal Desktop needs a few seconds to become interactive; use that
+        # window to warm the QR tooling (PATH probes, libzbar load) so the
+        # first capture doesn't pay for it.
+        if QR_UTILS_AVAILABLE:
+            threading.Thread(target=qr_utils.prewarm, daemon=True).start()
+
         return user_data_dir
     
-    def read_qr_code_automatically(self) -> Optional[str]:
+    def read_qr_code_automatically(self, max_qr_attempts: int = 2) -> Optional[str]:
         """Try to read QR code automatically if qr_utils is available"""
         if not QR_UTILS_AVAILABLE:
             return None
-        
-        qr_attempts = 0
-        max_qr_attempts = 2
-        
-        while qr_attempts < max_qr_attempts:
-            qr_attempts += 1
-            
+
+        # A plain bounded for-loop: success returns, anything else (bad scan
+        # or a capture error) just falls through to the next attempt.
+        for _ in range(max_qr_attempts):
             try:
                 qr_data = qr_utils.copy_qr_code_from_screenshot()
-                if qr_data and qr_data.startswith('sgnl://linkdevice?'):
-                    return qr_data
-                else:
-                    if qr_attempts < max_qr_attempts:
-                        # In the refactored version, we'll let the UI handle retry logic
-                        continue
-                    else:
-                        break
-                        
             except Exception:
-                if qr_attempts < max_qr_attempts:
-                    continue
-                else:
-                    break
-        
+                continue
+            if qr_data and qr_data.startswith(LINK_URI_PREFIX):
+                return qr_data
+
         return None
     
     def link_device_to_signal_cli(self, link_uri: str) -> bool:
         """Link the device using signal-cli"""
         try:
             subprocess.run([
-                'signal-cli', '-a', self.config.phone_number, 'addDevice', '--uri', link_uri
+                *self._cli_prefix, 'addDevice', '--uri', link_uri
             ], capture_output=True, text=True, check=True)
             return True
             
@@ -524,15 +601,19 @@ class SignalCLICore:
             raise DeviceLinkingError(f"Device linking failed: {e}")
     
     def sync_signal_data(self) -> bool:
-        """Sync contacts and groups from Signal Desktop"""
+        """Start syncing contacts and groups from Signal Desktop (background)"""
+        # The initial receive drain can take up to ~10s and its outcome never
+        # changes what we show the user; let it run while the success summary
+        # prints and reap it at exit instead of blocking here.
         try:
-            subprocess.run([
-                'signal-cli', '-a', self.config.phone_number, 'receive'
-            ], timeout=10, check=True)
-            return True
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-            # This is normal for initial setup
+            proc = subprocess.Popen([
+                *self._cli_prefix, 'receive'
+            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
+            # Sync is best-effort during initial setup
             return True
+        atexit.register(_reap_sync_process, proc)
+        return True
     
     def create_signal_app(self, app_config: AppConfig) -> Tuple[str, str]:
         """Create Signal Desktop .app file and return (app_path, app_name)"""
@@ -620,7 +701,9 @@ class SignalCLICore:
         return user_data_dir, created_app_name
 
 
-# Helper functions for common use cases
+# Helper functions for common use cases. The instruction strings never change
+# within a run, so memoize them rather than re-assembling on every call.
+@functools.lru_cache(maxsize=1)
 def get_captcha_instructions() -> str:
     """Get captcha token instructions"""
     return """=== Captcha Token Required ===
@@ -632,6 +715,7 @@ def get_captcha_instructions() -> str:
 """
 
 
+@functools.lru_cache(maxsize=8)
 def get_daemon_setup_info(phone_number: str, is_primary: bool = True) -> str:
     """Get daemon setup information"""
     if is_primary:
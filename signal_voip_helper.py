@@ -5,8 +5,13 @@ Modern CLI for Signal CLI registration and device linking
 """
 
 import argparse
+import contextlib
+import functools
+import re
+import subprocess
 import sys
 import os
+import threading
 import time
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict, Any
@@ -14,6 +19,8 @@ from dataclasses import dataclass, field
 
 # Import the core modules
 from signal_registration import (
+    CAPTCHA_URI_PREFIX,
+    LINK_URI_PREFIX,
     SignalCLICore,
     RegistrationConfig,
     AppConfig,
@@ -25,6 +32,7 @@ from signal_registration import (
     copy_signal_app_bundle_to_user_applications,
     get_captcha_instructions,
     get_daemon_setup_info,
+    is_valid_phone_number,
 )
 from launcher_icon_catalog import (
     LAUNCHER_ICON_CHOICES,
@@ -57,6 +65,101 @@ except ImportError:
     APP_BUILDER_AVAILABLE = False
 
 
+# SMS verification codes are exactly six digits.
+_VERIFICATION_CODE_RE = re.compile(r"^\d{6}$")
+
+
+def read_long_input(prompt: str) -> str:
+    """
+    Read one line that may be a multi-kilobyte paste (linking URIs). input()
+    feeds pastes through the tty's canonical line editor, which stalls visibly
+    and truncates around 1KB; non-canonical mode takes the whole paste in a
+    few bulk reads. Falls back to input() off-tty or if termios is unavailable.
+    """
+    print(prompt, end='', flush=True)
+    try:
+        import termios
+        if not sys.stdin.isatty():
+            raise OSError("stdin is not a tty")
+        fd = sys.stdin.fileno()
+        old_attrs = termios.tcgetattr(fd)
+    except Exception:
+        return input().strip()
+
+    new_attrs = termios.tcgetattr(fd)
+    new_attrs[3] &= ~termios.ICANON  # keep ECHO so the paste stays visible
+    chunks = []
+    try:
+        termios.tcsetattr(fd, termios.TCSADRAIN, new_attrs)
+        while True:
+            data = os.read(fd, 65536)
+            if not data:
+                break
+            chunks.append(data)
+            if b'\n' in data or b'\r' in data:
+                break
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+    print()  # the tty doesn't translate the pasted newline while non-canonical
+    line = b''.join(chunks).decode('utf-8', 'replace')
+    return line.split('\r')[0].split('\n')[0].strip()
+
+
+def _err(message: str) -> None:
+    """Error text belongs on stderr so scripted callers can separate it
+    from wizard output."""
+    print(message, file=sys.stderr)
+
+
+def _read_clipboard() -> str:
+    """Clipboard text via qr_utils' in-process NSPasteboard reader when
+    available (microseconds, no fork), else a pbpaste subprocess."""
+    if QR_UTILS_AVAILABLE:
+        return qr_utils.read_clipboard()
+    result = subprocess.run(['pbpaste'], capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def _yesno(prompt: str, default: bool = True) -> bool:
+    """
+    One-keystroke yes/no prompt: read a single byte in cbreak mode so the
+    user doesn't have to press Enter. Enter (or any key other than y/n)
+    keeps the default, matching the old input()-based prompts. Falls back
+    to a normal input() read off-tty or when termios is unavailable.
+    """
+    print(prompt, end='', flush=True)
+    try:
+        import termios
+        import tty
+        if not sys.stdin.isatty():
+            raise OSError("stdin is not a tty")
+        fd = sys.stdin.fileno()
+        old_attrs = termios.tcgetattr(fd)
+    except Exception:
+        answer = input().strip().lower()
+        if answer in ('y', 'yes'):
+            return True
+        if answer in ('n', 'no'):
+            return False
+        return default
+
+    try:
+        tty.setcbreak(fd)
+        ch = os.read(fd, 1).decode('utf-8', 'replace')
+        # Drop anything still queued ("es\n" from a typed "yes", the tail of
+        # an arrow-key escape sequence) so it can't leak into the next prompt.
+        termios.tcflush(fd, termios.TCIFLUSH)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+    # cbreak disables echo on some terminals; always show what was chosen
+    print(ch if ch not in ('\r', '\n') else '')
+    if ch in ('y', 'Y'):
+        return True
+    if ch in ('n', 'N'):
+        return False
+    return default
+
+
 @dataclass
 class UserConfig:
     """Configuration collected from user input"""
@@ -73,37 +176,34 @@ class UserConfig:
     needs_verification: bool = True  # Will be set dynamically during registration
 
 
+@functools.lru_cache(maxsize=32)
+def _box_frame(width: int, title: str) -> Tuple[str, str, str]:
+    """Top rule, blank row, bottom rule for a box — built once per (width, title)."""
+    title_section = f"┌─ {title} "
+    top = title_section + "─" * (width - len(title_section) - 1) + "┐"
+    blank = f"│{' ' * (width - 2)}│"
+    bottom = "└" + "─" * (width - 2) + "┘"
+    return top, blank, bottom
+
+
 class ModernCLI:
     """Modern CLI interface utilities"""
     
     @staticmethod
     def print_box(title: str, message: str = "", width: int = 60):
         """Print a formatted box with title and optional message"""
-        # Calculate title section length
-        title_section = f"─ {title} "
-        remaining_width = width - len(title_section) - 2  # -2 for the corner chars
-        
-        # Build the box
-        top = f"┌{title_section}" + "─" * remaining_width + "┐"
-        print(f"\n{top}")
-        print(f"│{' ' * (width - 2)}│")
-        
+        top, blank, bottom = _box_frame(width, title)
+        lines = ["", top, blank]
         if message:
-            # Center the message in the box
-            message_padding = (width - 2 - len(message)) // 2
-            padded_message = " " * message_padding + message + " " * (width - 3 - len(message) - message_padding)
-            print(f"│{padded_message}│")
-            print(f"│{' ' * (width - 2)}│")
-        
-        bottom = "└" + "─" * (width - 2) + "┘"
-        print(bottom)
+            lines.append(f"│{message.center(width - 2)}│")
+            lines.append(blank)
+        lines.append(bottom)
+        ModernCLI.emit(*lines)
     
     @staticmethod
     def box(title: str, width: int = 60) -> str:
         """Create a box with title - single line (deprecated, use print_box)"""
-        top = f"┌─ {title} " + "─" * (width - len(title) - 4) + "┐"
-        middle = f"│{' ' * (width - 2)}│"
-        bottom = "└" + "─" * (width - 2) + "┘"
+        top, middle, bottom = _box_frame(width, title)
         return f"{top}\n{middle}\n{bottom}"
     
     @staticmethod
@@ -111,22 +211,45 @@ class ModernCLI:
         """Create a section header"""
         return f"\n{emoji} {title}\n"
     
+    # Built once; progress_step runs twice per wizard step.
+    _STEP_ICONS = {
+        "pending": "○",
+        "in_progress": "●",
+        "completed": "✓",
+        "failed": "✗",
+    }
+
     @staticmethod
     def progress_step(step: str, status: str = "in_progress") -> str:
         """Create a progress step indicator"""
-        icons = {
-            "pending": "○",
-            "in_progress": "●", 
-            "completed": "✓",
-            "failed": "✗"
-        }
-        return f"{icons.get(status, '○')} {step}"
+        return f"{ModernCLI._STEP_ICONS.get(status, '○')} {step}"
+
+    @staticmethod
+    def step_status(step: str, i: int, total: int, status: str, note: str = "") -> None:
+        """Render one progress-line transition as a single stdout write.
+
+        in_progress leaves the cursor on the line; completed/failed rewrite
+        it with \r and finish it with a newline.
+        """
+        lead = "" if status == "in_progress" else "\r"
+        tail = "" if status == "in_progress" else "\n"
+        suffix = f" - {note}" if note else ""
+        sys.stdout.write(
+            f"{lead}{ModernCLI.progress_step(step, status)} ({i}/{total}){suffix}{tail}"
+        )
+        sys.stdout.flush()
     
     @staticmethod
     def choice_option(key: str, title: str, description: str) -> str:
         """Format a choice option"""
         return f"  {key}  {title:<20} - {description}"
     
+    @staticmethod
+    def emit(*lines: str) -> None:
+        """Write a multi-line banner as one stdout write instead of a print per
+        line — one syscall, so slow terminals render it without tearing."""
+        sys.stdout.write("\n".join(lines) + "\n")
+
     @staticmethod
     def input_prompt(prompt: str, help_text: str = "") -> str:
         """Format an input prompt"""
@@ -143,6 +266,12 @@ class SignalCLIInterface:
         self.core = None
         self.config = None
         self.ui = ModernCLI()
+        # Warm the QR tooling (imports, PATH probes, libzbar load) while the
+        # user is still reading prompts, so the first capture doesn't pay
+        # for it. prewarm() is idempotent; the later launch-time warm-up in
+        # the core becomes a no-op cache hit.
+        if QR_UTILS_AVAILABLE:
+            threading.Thread(target=qr_utils.prewarm, daemon=True).start()
     
     def show_welcome(self):
         """Show welcome screen"""
@@ -152,15 +281,14 @@ class SignalCLIInterface:
         """Check brew tools and signal-cli (install + version) before any CLI-dependent prompts."""
         print(self.ui.section_header("Checking Dependencies", "🔍"))
         
-        temp_config = RegistrationConfig(phone_number="+15551112222")  # dummy number for check
-        temp_core = SignalCLICore(temp_config)
-        
-        if not temp_core.check_brew_dependencies():
+        # These checks are account-independent, so no throwaway core (and no
+        # extra JVM spawn) is needed to run them.
+        if not SignalCLICore.check_brew_dependencies():
             print("⚠️  Please install the missing dependencies and run the script again.")
             return False
         
         try:
-            temp_core.check_signal_cli()
+            SignalCLICore.check_signal_cli()
         except SignalCLINotFoundError as e:
             print()
             print(f"❌ {e}")
@@ -189,23 +317,20 @@ class SignalCLIInterface:
             elif choice == "2":
                 mode = "addDevice"
                 # Check Signal Desktop status before proceeding
-                temp_config = RegistrationConfig(phone_number="+15551112222")  # temporary for check
-                temp_core = SignalCLICore(temp_config)
-                if temp_core.check_signal_desktop_running():
+                if SignalCLICore.check_signal_desktop_running():
                     print()
                     print(self.ui.section_header("Signal Desktop Check", "⚠️"))
                     print("Signal Desktop is currently running. For device linking to work properly,")
                     print("Signal Desktop needs to be completely quit first.")
                     print()
                     
-                    choice = input("? Automatically quit Signal Desktop? (Y/n) › ").strip().lower()
-                    if choice in ['n', 'no']:
+                    if not _yesno("? Automatically quit Signal Desktop? (Y/n) › "):
                         print("  ❌ Signal Desktop must be quit to proceed with device linking.")
                         print("  Please restart the script after quitting Signal Desktop.")
                         sys.exit(1)
                     
                     print("  ⏳ Quitting Signal Desktop...")
-                    if temp_core.quit_signal_desktop():
+                    if SignalCLICore.quit_signal_desktop():
                         print("  ✅ Signal Desktop quit successfully")
                     else:
                         print("  ❌ Could not quit Signal Desktop automatically")
@@ -222,7 +347,7 @@ class SignalCLIInterface:
                 "What's your phone number?", 
                 "Include country code (e.g., +15551112222)"
             )).strip()
-            if phone_number and phone_number.startswith('+') and len(phone_number) > 5:
+            if is_valid_phone_number(phone_number):
                 break
             print("  ❌ Please enter a valid phone number with country code")
         
@@ -251,23 +376,26 @@ class SignalCLIInterface:
             print(f"⚠️  Could not open browser automatically: {e}")
             print("Please manually open: https://signalcaptchas.org/registration/generate.html")
         
-        print()
-        print("Steps:")
-        print("1. Solve the captcha in your browser")
-        print("2. Your existing Signal Desktop app will open, but you should close it")
-        print("3. Right click on the 'Open Signal' link and click 'Copy link address'")
-        print("4. Come back here when you've copied the link")
-        print()
+        self.ui.emit(
+            "",
+            "Steps:",
+            "1. Solve the captcha in your browser",
+            "2. Your existing Signal Desktop app will open, but you should close it",
+            "3. Right click on the 'Open Signal' link and click 'Copy link address'",
+            "",
+        )
+        
+        # Watch the clipboard so copying the link advances the wizard by
+        # itself — no confirmation roundtrip. Ctrl+C (or the timeout) falls
+        # back to the confirm-then-read prompt below.
+        if self._watch_clipboard_for_captcha(config):
+            return self._collect_pin_preference(config)
         
         while True:
-            ready = input("? Have you copied the captcha token to your clipboard? (y/N) › ").strip().lower()
-            
-            if ready in ['y', 'yes']:
+            if _yesno("? Have you copied the captcha token to your clipboard? (y/N) › ", default=False):
                 # Try to read from clipboard
                 try:
-                    import subprocess
-                    result = subprocess.run(['pbpaste'], capture_output=True, text=True, check=True)
-                    captcha_input = result.stdout.strip()
+                    captcha_input = _read_clipboard().strip()
                     
                     if not captcha_input:
                         print("  ❌ Clipboard is empty. Please copy the captcha token first.")
@@ -275,14 +403,9 @@ class SignalCLIInterface:
                     
                     print(f"  ✓ Read captcha token from clipboard ({len(captcha_input)} chars)")
                     
-                    # Extract token
-                    if captcha_input.startswith('signalcaptcha://'):
-                        config.captcha_token = captcha_input[len('signalcaptcha://'):]
-                    elif 'signalcaptcha://' in captcha_input:
-                        start = captcha_input.find('signalcaptcha://') + len('signalcaptcha://')
-                        config.captcha_token = captcha_input[start:]
-                    else:
-                        config.captcha_token = captcha_input
+                    # Extract token (same single-pass parse as the core module)
+                    _prefix, sep, token = captcha_input.partition(CAPTCHA_URI_PREFIX)
+                    config.captcha_token = token if sep else captcha_input
                     break
                         
                 except Exception as e:
@@ -293,15 +416,49 @@ class SignalCLIInterface:
                 print("  💡 Please complete the captcha steps above and copy the token")
                 continue
         
+        self._collect_pin_preference(config)
+    
+    def _watch_clipboard_for_captcha(self, config: UserConfig, timeout: float = 120.0) -> bool:
+        """Poll the clipboard until a fresh signalcaptcha:// link shows up.
+
+        Returns True (and fills config.captcha_token) once a link is seen;
+        False on timeout, Ctrl+C, or clipboard errors so the caller can fall
+        back to the interactive prompt.
+        """
+        print("⏳ Waiting for the captcha link to land on your clipboard... (Ctrl+C to type instead)")
+        # Captcha links are single-use, so a link already on the clipboard is
+        # almost certainly stale (e.g. a previous run's). Snapshot it and only
+        # accept a value that appears after we started watching; the
+        # confirm-then-read fallback still covers copied-in-advance cases.
+        try:
+            baseline = _read_clipboard().strip()
+        except Exception:
+            return False
+        deadline = time.monotonic() + timeout
+        try:
+            while time.monotonic() < deadline:
+                time.sleep(0.25)
+                clip = _read_clipboard().strip()
+                if clip != baseline and CAPTCHA_URI_PREFIX in clip:
+                    print(f"  ✓ Captcha link detected on clipboard ({len(clip)} chars)")
+                    _prefix, sep, token = clip.partition(CAPTCHA_URI_PREFIX)
+                    config.captcha_token = token if sep else clip
+                    return True
+        except KeyboardInterrupt:
+            print()
+        except Exception:
+            pass
+        return False
+    
+    def _collect_pin_preference(self, config: UserConfig):
+        """Ask about carrier SMS PINs (shared by both captcha-entry paths)."""
         print()
-        print(
+        if _yesno(
             "? Some carriers (e.g. Google Voice) send a separate PIN in SMS during "
             "verification — not registration lock. Do you need to enter that SMS PIN "
             "when you verify? (y/N) › ",
-            end="",
-        )
-        has_pin = input().strip().lower()
-        if has_pin in ["y", "yes"]:
+            default=False,
+        ):
             print()
             print("💡 If using Google Voice, check your spam folder for that PIN")
             config.pin_code = input(self.ui.input_prompt("Enter the SMS PIN")).strip()
@@ -317,21 +474,21 @@ class SignalCLIInterface:
         
         # Check screen recording permission first
         if QR_UTILS_AVAILABLE:
-            has_permission = input("? Have you given your terminal app permission to record your screen? (Y/n) › ").strip().lower()
-            
-            if has_permission in ['n', 'no']:
-                print()
-                print("📋 Please grant screen recording permission:")
-                print()
-                print("1. Open: System Settings > Privacy & Security")
-                print("2. Click: Screen & System Audio Recording")
-                print("3. Find your terminal app (Terminal, iTerm2, etc.)")
-                print("4. Toggle it ON")
-                print("5. Restart your terminal app")
-                print()
-                print("⚠️  The QR code reading feature won't work without this permission")
-                print("   (You can still enter the linking URI manually)")
-                print()
+            if not _yesno("? Have you given your terminal app permission to record your screen? (Y/n) › "):
+                self.ui.emit(
+                    "",
+                    "📋 Please grant screen recording permission:",
+                    "",
+                    "1. Open: System Settings > Privacy & Security",
+                    "2. Click: Screen & System Audio Recording",
+                    "3. Find your terminal app (Terminal, iTerm2, etc.)",
+                    "4. Toggle it ON",
+                    "5. Restart your terminal app",
+                    "",
+                    "⚠️  The QR code reading feature won't work without this permission",
+                    "   (You can still enter the linking URI manually)",
+                    "",
+                )
                 input("Press Enter to continue after granting permission › ")
                 print()
         
@@ -340,15 +497,13 @@ class SignalCLIInterface:
             return
         
         print()
-        create_choice = input("? Create a Signal Desktop app launcher? (Y/n) › ").strip().lower()
-        config.create_app = create_choice not in ['n', 'no']
+        config.create_app = _yesno("? Create a Signal Desktop app launcher? (Y/n) › ")
         
         if config.create_app:
             print()
-            copy_choice = input(
+            config.copy_to_applications = _yesno(
                 "? Copy launcher app to your user Applications folder (~/Applications)? (Y/n) › "
-            ).strip().lower()
-            config.copy_to_applications = copy_choice not in ['n', 'no']
+            )
             
             print()
             phone_number_clean = config.phone_number.replace('+', '')
@@ -412,8 +567,7 @@ class SignalCLIInterface:
         print("─" * 60)
         print()
         
-        confirm = input("? Ready to proceed with this configuration? (Y/n) › ").strip().lower()
-        return confirm not in ['n', 'no']
+        return _yesno("? Ready to proceed with this configuration? (Y/n) › ")
     
 
     
@@ -427,7 +581,7 @@ class SignalCLIInterface:
         
         while True:
             code = input("? Enter verification code › ").strip()
-            if code and len(code) == 6 and code.isdigit():
+            if _VERIFICATION_CODE_RE.match(code):
                 return code
             print("  ❌ Please enter a valid 6-digit code")
     
@@ -441,7 +595,7 @@ class SignalCLIInterface:
             
             try:
                 qr_data = qr_utils.copy_qr_code_from_screenshot()
-                if qr_data and qr_data.startswith('sgnl://linkdevice?'):
+                if qr_data and qr_data.startswith(LINK_URI_PREFIX):
                     print("✓ QR code read successfully")
                     return qr_data
                 else:
@@ -449,32 +603,23 @@ class SignalCLIInterface:
             except Exception as e:
                 print(f"❌ QR reading failed: {e}")
         
-        print("\nManual URI input:")
-        print("1. Copy the linking URI from Signal Desktop")
-        print("2. It should start with 'sgnl://linkdevice?'")
-        print()
+        self.ui.emit(
+            "",
+            "Manual URI input:",
+            "1. Copy the linking URI from Signal Desktop",
+            f"2. It should start with '{LINK_URI_PREFIX}'",
+            "",
+        )
         
         while True:
-            uri = input("? Enter linking URI › ").strip()
+            # read_long_input drains the paste in bulk reads with the tty out
+            # of canonical mode, so the old ~1KB truncation heuristic (and its
+            # clipboard-recovery fallback) is no longer needed.
+            uri = read_long_input("? Enter linking URI › ")
             
-            # Check if input might be truncated (common terminal buffer limit)
-            if len(uri) >= 1020 and not uri.endswith('='):
-                print("  💡 Input may be truncated. Trying to read from clipboard...")
-                try:
-                    import subprocess
-                    result = subprocess.run(['pbpaste'], capture_output=True, text=True, check=True)
-                    clipboard_content = result.stdout.strip()
-                    if clipboard_content and len(clipboard_content) > len(uri):
-                        print(f"  ✓ Using clipboard content ({len(clipboard_content)} chars)")
-                        uri = clipboard_content
-                    else:
-                        print("  ⚠️  Clipboard doesn't contain longer text, using typed input")
-                except Exception:
-                    print("  ⚠️  Could not read clipboard, using typed input")
-            
-            if uri.startswith('sgnl://linkdevice?'):
+            if uri.startswith(LINK_URI_PREFIX):
                 return uri
-            print("  ❌ URI should start with 'sgnl://linkdevice?'")
+            print(f"  ❌ URI should start with '{LINK_URI_PREFIX}'")
     
     def print_error(self, message: str):
         """Print error message"""
@@ -497,38 +642,58 @@ class SignalCLIInterface:
         elif config.operation_mode == "addDevice":
             self._execute_device_linking(config)
     
+    # Step tables are static; build them once at class definition instead of
+    # per run. Device linking keeps two variants rather than filtering None
+    # out of a rebuilt list each time.
+    _REGISTRATION_STEPS = (
+        "Checking signal-cli installation",
+        "Initiating registration",
+        "Checking registration status",
+        "Verification (if needed)",
+        "Testing setup",
+        "Finalizing",
+    )
+
+    _LINKING_STEPS_WITH_APP = (
+        "Checking signal-cli installation",
+        "Verifying account registration",
+        "Creating Signal Desktop app",
+        "Launching Signal Desktop",
+        "Reading QR code",
+        "Linking device",
+        "Syncing data",
+        "Finalizing",
+    )
+
+    _LINKING_STEPS_NO_APP = tuple(
+        s for s in _LINKING_STEPS_WITH_APP if s != "Creating Signal Desktop app"
+    )
+
     def _execute_registration(self, config: UserConfig):
         """Execute registration with progress tracking"""
-        steps = [
-            "Checking signal-cli installation",
-            "Initiating registration",
-            "Checking registration status",
-            "Verification (if needed)", 
-            "Testing setup",
-            "Finalizing"
-        ]
+        steps = self._REGISTRATION_STEPS
         
         for i, step in enumerate(steps, 1):
-            print(f"{self.ui.progress_step(step, 'in_progress')} ({i}/{len(steps)})", end='', flush=True)
+            self.ui.step_status(step, i, len(steps), 'in_progress')
             
             try:
                 if step == "Checking signal-cli installation":
                     self.config = RegistrationConfig(phone_number=config.phone_number)
                     self.core = SignalCLICore(self.config)
                     self.core.check_signal_cli()
-                    print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                 
                 elif step == "Initiating registration":
                     self.core.register_sms(config.captcha_token)
-                    print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                 
                 elif step == "Checking registration status":
                     # Check if device is already registered after captcha submission
                     config.needs_verification = not self.core.verify_account_registered()
                     if config.needs_verification:
-                        print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)}) - SMS verification needed")
+                        self.ui.step_status(step, i, len(steps), 'completed', 'SMS verification needed')
                     else:
-                        print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)}) - already registered")
+                        self.ui.step_status(step, i, len(steps), 'completed', 'already registered')
                 
                 elif step == "Verification (if needed)":
                     if hasattr(config, 'needs_verification') and config.needs_verification:
@@ -536,49 +701,47 @@ class SignalCLIInterface:
                             print()  # Add newline before verification section
                             config.verification_code = self.get_verification_code_with_context()
                         self.core.verify_registration(config.verification_code, config.pin_code)
-                        print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                        self.ui.step_status(step, i, len(steps), 'completed')
                     else:
-                        print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)}) - skipped")
+                        self.ui.step_status(step, i, len(steps), 'completed', 'skipped')
                 
                 elif step == "Testing setup":
                     if self.core.test_registration():
                         pass  # Silent success
-                    print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                 
                 elif step == "Finalizing":
-                    print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                 
             except Exception as e:
-                print(f"\r{self.ui.progress_step(step, 'failed')} ({i}/{len(steps)})")
+                self.ui.step_status(step, i, len(steps), 'failed')
                 raise e
         
         self._show_registration_success(config)
     
     def _execute_device_linking(self, config: UserConfig):
         """Execute device linking with progress tracking"""
-        steps = [
-            "Checking signal-cli installation",
-            "Verifying account registration",
-            "Creating Signal Desktop app" if config.create_app else None,
-            "Launching Signal Desktop",
-            "Reading QR code",
-            "Linking device",
-            "Syncing data",
-            "Finalizing"
-        ]
-        steps = [s for s in steps if s is not None]  # Remove None steps
+        steps = (
+            self._LINKING_STEPS_WITH_APP
+            if config.create_app
+            else self._LINKING_STEPS_NO_APP
+        )
         
         created_app_name = None
         
         for i, step in enumerate(steps, 1):
-            print(f"{self.ui.progress_step(step, 'in_progress')} ({i}/{len(steps)})", end='', flush=True)
+            self.ui.step_status(step, i, len(steps), 'in_progress')
             
             try:
                 if step == "Checking signal-cli installation":
-                    self.config = RegistrationConfig(phone_number=config.phone_number)
-                    self.core = SignalCLICore(self.config)
+                    # Reuse the registration flow's core when it chains into
+                    # linking: its registered-state memo then answers the next
+                    # step without another signal-cli spawn.
+                    if self.core is None or self.config.phone_number != config.phone_number:
+                        self.config = RegistrationConfig(phone_number=config.phone_number)
+                        self.core = SignalCLICore(self.config)
                     self.core.check_signal_cli()
-                    print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                 
                 elif step == "Verifying account registration":
                     if not self.core.verify_account_registered():
@@ -586,7 +749,7 @@ class SignalCLIInterface:
                             f"Account {config.phone_number} is not registered. "
                             "Please run registration first."
                         )
-                    print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                 
                 elif step == "Creating Signal Desktop app":
                     app_config = AppConfig(
@@ -595,34 +758,32 @@ class SignalCLIInterface:
                         output_dir=None,
                         launcher_icon_id=config.launcher_icon_id,
                     )
-                    # Suppress verbose output from app creation
-                    import sys
-                    from io import StringIO
-                    old_stdout = sys.stdout
-                    sys.stdout = StringIO()
-                    try:
+                    # Suppress verbose output from app creation; devnull
+                    # discards writes at the OS level instead of growing an
+                    # in-memory buffer, and the context managers restore
+                    # stdout on any exception.
+                    with open(os.devnull, 'w') as devnull, \
+                            contextlib.redirect_stdout(devnull):
                         app_path, created_app_name = self.core.create_signal_app(app_config)
-                    finally:
-                        sys.stdout = old_stdout
-                    print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                     print(f"  • Created: {created_app_name}")
                 
                 elif step == "Launching Signal Desktop":
                     user_data_dir = self.core.launch_signal_desktop()
-                    print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                 
                 elif step == "Reading QR code":
                     print()  # Add newline before QR section
                     link_uri = self.get_linking_uri_with_context()
-                    print(f"{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                 
                 elif step == "Linking device":
                     self.core.link_device_to_signal_cli(link_uri)
-                    print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                 
                 elif step == "Syncing data":
                     self.core.sync_signal_data()
-                    print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                 
                 elif step == "Finalizing":
                     if created_app_name and config.copy_to_applications:
@@ -634,10 +795,10 @@ class SignalCLIInterface:
                             print(f"  • {copy_msg}")
                         else:
                             print(f"  • Could not copy: {copy_msg}")
-                    print(f"\r{self.ui.progress_step(step, 'completed')} ({i}/{len(steps)})")
+                    self.ui.step_status(step, i, len(steps), 'completed')
                 
             except Exception as e:
-                print(f"\r{self.ui.progress_step(step, 'failed')} ({i}/{len(steps)})")
+                self.ui.step_status(step, i, len(steps), 'failed')
                 raise e
         
         self._show_device_linking_success(config, created_app_name)
@@ -645,14 +806,16 @@ class SignalCLIInterface:
     def _show_registration_success(self, config: UserConfig):
         """Show registration success message and optionally continue with Signal Desktop setup"""
         self.ui.print_box("Success!", "✅ Signal CLI registered successfully!")
-        print()
-        print("🎯 What's next?")
-        print()
-        print(f"   signal-cli -a {config.phone_number} receive    # Check messages")
-        print(f"   signal-cli -a {config.phone_number} daemon     # Run continuously")
-        print()
-        print("💾 Account data stored in: ~/.local/share/signal-cli/data/")
-        print()
+        self.ui.emit(
+            "",
+            "🎯 What's next?",
+            "",
+            f"   signal-cli -a {config.phone_number} receive    # Check messages",
+            f"   signal-cli -a {config.phone_number} daemon     # Run continuously",
+            "",
+            "💾 Account data stored in: ~/.local/share/signal-cli/data/",
+            "",
+        )
         
         self._offer_registration_lock_pin(config)
         print()
@@ -662,9 +825,7 @@ class SignalCLIInterface:
         
         # Ask if they want to set up Signal Desktop
         try:
-            setup_desktop = input("? Would you like to set up Signal Desktop now? (Y/n) › ").strip().lower()
-            
-            if setup_desktop not in ['n', 'no']:
+            if _yesno("? Would you like to set up Signal Desktop now? (Y/n) › "):
                 print()
                 print("🔄 Continuing with Signal Desktop setup...")
                 
@@ -735,10 +896,9 @@ class SignalCLIInterface:
                 "   Re-run install to recreate it (safe):"
             )
             try:
-                fix = input(
+                if not _yesno(
                     "? Repair now (recreate script and reload job)? (Y/n) › "
-                ).strip().lower()
-                if fix in ("n", "no"):
+                ):
                     print(
                         f"   Run later: python3 signal_voip_helper.py installReceiveJob {phone_number}"
                     )
@@ -762,11 +922,10 @@ class SignalCLIInterface:
             )
             return
         try:
-            choice = input(
+            if not _yesno(
                 "? Install a daily background job to fetch messages with signal-cli "
                 "(recommended — keeps encryption/session healthy)? (Y/n) › "
-            ).strip().lower()
-            if choice in ("n", "no"):
+            ):
                 print(
                     "   You can install it later with:\n"
                     f"   python3 signal_voip_helper.py installReceiveJob {phone_number}"
@@ -911,10 +1070,10 @@ class SignalCLIInterface:
 
         do_copy = copy_to_user_applications
         if not do_copy and interactive:
-            cp = input(
-                "? Copy this app to ~/Applications (easy to find in Finder)? (y/N) › "
-            ).strip().lower()
-            do_copy = cp in ("y", "yes")
+            do_copy = _yesno(
+                "? Copy this app to ~/Applications (easy to find in Finder)? (y/N) › ",
+                default=False,
+            )
 
         if do_copy:
             ok, msg = copy_signal_app_bundle_to_user_applications(
@@ -929,13 +1088,40 @@ class SignalCLIInterface:
         """Run the modern wizard with upfront configuration collection"""
         self.show_welcome()
         
-        # Check dependencies before proceeding
-        if not self.check_dependencies_upfront():
+        print(self.ui.section_header("Checking Dependencies", "🔍"))
+        
+        # The brew probe is in-process PATH lookups — run it (and report)
+        # before prompting.
+        if not SignalCLICore.check_brew_dependencies():
+            print("⚠️  Please install the missing dependencies and run the script again.")
             sys.exit(1)
         
+        # The signal-cli probe is a JVM start plus a GitHub release lookup —
+        # by far the slowest preflight. Overlap it with the configuration
+        # prompts; its result is process-cached, so the later
+        # check_signal_cli step inside the execute flow becomes a no-op.
+        cli_check_error = []
+        
+        def _probe_signal_cli():
+            try:
+                SignalCLICore.check_signal_cli()
+            except SignalCLINotFoundError as e:
+                cli_check_error.append(e)
+        
+        probe = threading.Thread(target=_probe_signal_cli, daemon=True)
+        probe.start()
+        
         # Collect all configuration upfront
         config = self.collect_user_configuration()
         
+        probe.join()
+        if cli_check_error:
+            print()
+            print(f"❌ {cli_check_error[0]}")
+            print()
+            print("⚠️  Fix the issue above and run the script again.")
+            sys.exit(1)
+        
         # Show summary and confirm
         if not self.show_configuration_summary(config):
             print("❌ Setup cancelled")
@@ -945,9 +1131,7 @@ class SignalCLIInterface:
             # Execute with progress indicators
             self.execute_with_progress(config)
             
-        except (SignalCLINotFoundError, RegistrationFailedError, 
-                VerificationFailedError, DeviceLinkingError, 
-                SignalRegistrationError) as e:
+        except SignalRegistrationError as e:
             print(f"\n❌ {e}")
             sys.exit(1)
         except KeyboardInterrupt:
@@ -957,13 +1141,28 @@ class SignalCLIInterface:
             print(f"\n❌ Unexpected error: {e}")
             sys.exit(1)
     
-    def run_with_params(self, mode: str, phone_number: str, captcha_token: Optional[str] = None, 
+    def run_with_params(self, mode: str, phone_number: str, captcha_token: Optional[str] = None,
                        device_name: str = "signal-cli-desktop"):
         """Run with command line parameters - using modern flow"""
+        # Reject malformed numbers before any signal-cli spawn
+        if not is_valid_phone_number(phone_number):
+            _err(f"❌ Error: Invalid phone number: {phone_number}")
+            _err("   Use international format, e.g. +15551112222")
+            sys.exit(1)
+
         # Check dependencies first
         if not self.check_dependencies_upfront():
             sys.exit(1)
         
+        # Accept the full signalcaptcha:// link on --captcha, as the epilog
+        # promises: normalize to the bare token once, here, so register_sms
+        # (which re-prepends the scheme) doesn't double it up.
+        if captcha_token:
+            captcha_token = captcha_token.strip('"\'')
+            _prefix, sep, token = captcha_token.partition(CAPTCHA_URI_PREFIX)
+            if sep:
+                captcha_token = token
+        
         # Create a UserConfig from the parameters
         config = UserConfig(
             phone_number=phone_number,
@@ -973,29 +1172,21 @@ class SignalCLIInterface:
         )
 
         
-        if mode == "register" and not config.captcha_token:
-            print("❌ Error: Captcha token is required for registration")
-            sys.exit(1)
-        
         try:
             # Execute with our modern progress system
             self.execute_with_progress(config)
             
-        except (SignalCLINotFoundError, RegistrationFailedError, 
-                VerificationFailedError, DeviceLinkingError, 
-                SignalRegistrationError) as e:
-            print(f"❌ {e}")
+        except SignalRegistrationError as e:
+            # Base class of every domain error (not-found, registration,
+            # verification, linking) — one handler instead of five.
+            _err(f"❌ {e}")
             sys.exit(1)
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
+            _err(f"❌ Unexpected error: {e}")
             sys.exit(1)
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Signal CLI Registration Script",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_EPILOG = """
 Examples:
   # Interactive wizard mode
   python3 signal_voip_helper.py
@@ -1019,7 +1210,20 @@ Examples:
 Note: For captcha tokens, you can:
 1. Paste the full line from the browser console
 2. Paste just the token part
-        """
+"""
+
+
+def main():
+    # A bare launch is the wizard; don't build the full parser (large epilog,
+    # ten add_argument calls) just to discover there was nothing to parse.
+    if len(sys.argv) == 1:
+        SignalCLIInterface().run_modern_wizard()
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Signal CLI Registration Script",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
     )
     
     parser.add_argument(
@@ -1068,15 +1272,11 @@ Note: For captcha tokens, you can:
     
     args = parser.parse_args()
     
-    interface = SignalCLIInterface()
-    
-    # If no arguments provided, run wizard mode
-    if not args.mode:
-        interface.run_modern_wizard()
-        return
-
+    # Constructing the interface kicks off the QR prewarm thread; defer it to
+    # the branches that actually drive the interactive flows so usage errors
+    # and the receive-job modes never pay for it.
     if args.mode == "regenerateLauncher":
-        interface.run_regenerate_launcher(
+        SignalCLIInterface().run_regenerate_launcher(
             phone=args.phone_number,
             app_name=args.app_name,
             icon_id=args.launcher_icon,
@@ -1087,10 +1287,14 @@ Note: For captcha tokens, you can:
     
     # Parameter mode
     if not args.phone_number:
-        print("❌ Error: Phone number is required for parameter mode")
+        _err("❌ Error: Phone number is required for parameter mode")
         parser.print_help()
         sys.exit(1)
 
+    # Fail at parse time, before dependency checks or any signal-cli spawn.
+    if args.mode == "register" and not args.captcha:
+        parser.error("register mode requires --captcha <token>")
+
     if args.mode == "installReceiveJob":
         if needs_receive_job_repair(args.phone_number):
             print(
@@ -1115,7 +1319,7 @@ Note: For captcha tokens, you can:
         print(msg if ok else f"❌ {msg}")
         sys.exit(0 if ok else 1)
     
-    interface.run_with_params(
+    SignalCLIInterface().run_with_params(
         args.mode,
         args.phone_number,
         args.captcha,